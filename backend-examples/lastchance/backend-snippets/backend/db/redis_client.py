@@ -0,0 +1,104 @@
+import json
+import logging
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cache payload to bytes."""
+    if isinstance(value, (bytes, str)):
+        # Already serialized by the caller
+        return value
+    if orjson is not None:
+        # orjson is a C extension, 3-10x faster than stdlib json, and
+        # serializes datetime and NumPy values natively.
+        return orjson.dumps(
+            value, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(value, default=str).encode()
+
+
+def _loads(payload: bytes) -> Any:
+    """Deserialize a cache payload."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class RedisClient:
+    """Async Redis client with JSON (de)serialization of cached values."""
+
+    def __init__(self):
+        self.redis: Optional[redis.Redis] = None
+
+    async def connect(self):
+        """Open the Redis connection pool."""
+        if self.redis is None:
+            self.redis = redis.from_url(settings.REDIS_URL)
+
+    async def get(self, key: str) -> Any:
+        """Get and deserialize a cached value, or None if missing."""
+        try:
+            await self.connect()
+            payload = await self.redis.get(key)
+            if payload is None:
+                return None
+            return _loads(payload)
+        except Exception as e:
+            logger.error(f"Redis GET error for {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Serialize and cache a value with optional TTL in seconds."""
+        try:
+            await self.connect()
+            await self.redis.set(key, _dumps(value), ex=expire)
+            return True
+        except Exception as e:
+            logger.error(f"Redis SET error for {key}: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached key."""
+        try:
+            await self.connect()
+            await self.redis.delete(key)
+            return True
+        except Exception as e:
+            logger.error(f"Redis DELETE error for {key}: {e}")
+            return False
+
+    async def publish(self, channel: str, value: Any) -> bool:
+        """Serialize and publish a value to a Pub/Sub channel."""
+        try:
+            await self.connect()
+            await self.redis.publish(channel, _dumps(value))
+            return True
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for {channel}: {e}")
+            return False
+
+    async def pubsub(self) -> redis.client.PubSub:
+        """Return a Pub/Sub handle on the shared connection pool."""
+        await self.connect()
+        return self.redis.pubsub()
+
+    async def close(self):
+        """Close the Redis connection."""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+
+# Global Redis client instance
+redis_client = RedisClient()
@@ -0,0 +1,93 @@
+"""Native trade-simulation kernel for the walk-forward backtester.
+
+The inner loop of ``WalkForwardBacktest._simulate_trading`` is a branchy
+scalar state machine over N bars. When numba is available the loop is
+JIT-compiled to native code; otherwise the same function runs as a plain
+Python loop over NumPy arrays, so numba stays an optional dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _simulate(prices, signals, total_cost_bps, capital0, position0, entry0):
+    """Run the trading state machine over one fold.
+
+    Args:
+        prices: float64 close prices
+        signals: int64 signals (1 = BUY, -1 = SELL, 0 = no action)
+        total_cost_bps: fees + slippage in basis points
+        capital0: starting capital
+        position0: starting position (0 = flat, 1 = long)
+        entry0: entry price of the open position, if any
+
+    Returns:
+        Tuple of parallel per-bar arrays:
+        (trade_action, trade_price, trade_cost, trade_exit, trade_pnl,
+         equity_capital, equity_position, equity_entry, equity_value)
+        where trade_action is 1 for BUY, -1 for SELL, 0 for no trade and
+        the trade_* arrays are zero on bars without a trade.
+    """
+    n = len(prices)
+    trade_action = np.zeros(n, np.int8)
+    trade_price = np.zeros(n, np.float64)
+    trade_cost = np.zeros(n, np.float64)
+    trade_exit = np.zeros(n, np.float64)
+    trade_pnl = np.zeros(n, np.float64)
+    equity_capital = np.empty(n, np.float64)
+    equity_position = np.empty(n, np.int8)
+    equity_entry = np.empty(n, np.float64)
+    equity_value = np.empty(n, np.float64)
+
+    capital = capital0
+    position = position0
+    entry_price = entry0
+
+    # Constant per run; hoisted out of the loop
+    cost_buy = 1.0 + total_cost_bps / 10000.0
+    cost_sell = 1.0 - total_cost_bps / 10000.0
+
+    for i in range(n):
+        signal = signals[i]
+        price = prices[i]
+
+        if signal == 1 and position == 0:  # BUY
+            entry_price = price * cost_buy
+            position = 1
+
+            trade_action[i] = 1
+            trade_price[i] = price
+            trade_cost[i] = entry_price
+
+        elif signal == -1 and position == 1:  # SELL
+            exit_price = price * cost_sell
+            pnl = capital * ((exit_price - entry_price) / entry_price)
+            capital += pnl
+            position = 0
+
+            trade_action[i] = -1
+            trade_price[i] = price
+            trade_exit[i] = exit_price
+            trade_pnl[i] = pnl
+
+        current_value = capital
+        if position == 1:
+            current_value = capital + capital * ((price - entry_price) / entry_price)
+
+        equity_capital[i] = capital
+        equity_position[i] = position
+        equity_entry[i] = entry_price if position == 1 else 0.0
+        equity_value[i] = current_value
+
+    return (
+        trade_action, trade_price, trade_cost, trade_exit, trade_pnl,
+        equity_capital, equity_position, equity_entry, equity_value
+    )
+
+
+if njit is not None:
+    _simulate = njit(cache=True)(_simulate)
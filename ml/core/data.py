@@ -1,11 +1,41 @@
 """Data loading, feature engineering, and labeling for ML pipeline."""
 
 import os
+import functools
 from typing import Dict, List, Optional, Tuple, Literal
 import pandas as pd
 import numpy as np
 from datasets import load_dataset
-import ta
+
+
+def _ema(series: pd.Series, period: int) -> np.ndarray:
+    """Exponential moving average over a span, NaN until the window fills."""
+    return series.ewm(span=period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def _rsi(close: pd.Series, period: int) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    delta = close.diff()
+    gain = delta.clip(lower=0.0)
+    loss = -delta.clip(upper=0.0)
+    avg_gain = gain.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    rs = avg_gain / (avg_loss + 1e-10)
+    return (100.0 - 100.0 / (1.0 + rs)).to_numpy()
+
+
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    tr = np.empty(len(close))
+    tr[0] = high[0] - low[0]
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(
+        high[1:] - low[1:],
+        np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close))
+    )
+    return pd.Series(tr).ewm(
+        alpha=1.0 / period, adjust=False, min_periods=period
+    ).mean().to_numpy()
 
 
 def load_hf_dataset(
@@ -78,59 +108,80 @@ def feature_engineering(
     Returns:
         DataFrame with additional feature columns
     """
-    df = df.copy()
+    close_s = df["close"]
+    close = close_s.to_numpy(np.float64)
+    volume = df["volume"].to_numpy(np.float64)
+
+    # Compute every indicator into plain arrays and assemble the frame in
+    # one concat at the end: repeated df[...] assignments fragment the
+    # block manager, and the ta library allocates intermediate Series per
+    # indicator on top of that
+    feat = {}
 
     # EMA features
     ema_periods = config.get("ema_periods", [12, 26, 50, 200])
     for period in ema_periods:
-        df[f"ema_{period}"] = ta.trend.ema_indicator(df["close"], window=period)
+        feat[f"ema_{period}"] = _ema(close_s, period)
 
     # RSI
     rsi_period = config.get("rsi_period", 14)
-    df["rsi"] = ta.momentum.rsi(df["close"], window=rsi_period)
+    feat["rsi"] = _rsi(close_s, rsi_period)
 
     # MACD
     macd_params = config.get("macd_params", {"fast": 12, "slow": 26, "signal": 9})
-    macd = ta.trend.MACD(
-        df["close"],
-        window_slow=macd_params["slow"],
-        window_fast=macd_params["fast"],
-        window_sign=macd_params["signal"]
-    )
-    df["macd"] = macd.macd()
-    df["macd_signal"] = macd.macd_signal()
-    df["macd_diff"] = macd.macd_diff()
+    macd_line = _ema(close_s, macd_params["fast"]) - _ema(close_s, macd_params["slow"])
+    macd_signal = pd.Series(macd_line, index=df.index).ewm(
+        span=macd_params["signal"], adjust=False, min_periods=macd_params["signal"]
+    ).mean().to_numpy()
+    feat["macd"] = macd_line
+    feat["macd_signal"] = macd_signal
+    feat["macd_diff"] = macd_line - macd_signal
 
     # ATR
     atr_period = config.get("atr_period", 14)
-    df["atr"] = ta.volatility.average_true_range(df["high"], df["low"], df["close"], window=atr_period)
+    feat["atr"] = _atr(
+        df["high"].to_numpy(np.float64), df["low"].to_numpy(np.float64),
+        close, atr_period
+    )
 
-    # Bollinger Bands
-    bb = ta.volatility.BollingerBands(df["close"], window=20, window_dev=2)
-    df["bb_upper"] = bb.bollinger_hband()
-    df["bb_middle"] = bb.bollinger_mavg()
-    df["bb_lower"] = bb.bollinger_lband()
-    df["bb_width"] = bb.bollinger_wband()
+    # Bollinger Bands: one rolling pass, mean/std reused for every band
+    roll = close_s.rolling(20)
+    bb_middle = roll.mean().to_numpy()
+    bb_std = roll.std(ddof=0).to_numpy()
+    bb_upper = bb_middle + 2 * bb_std
+    bb_lower = bb_middle - 2 * bb_std
+    feat["bb_upper"] = bb_upper
+    feat["bb_middle"] = bb_middle
+    feat["bb_lower"] = bb_lower
+    feat["bb_width"] = (bb_upper - bb_lower) / bb_middle * 100
 
     # Volume features
-    df["volume_ema"] = ta.trend.ema_indicator(df["volume"], window=20)
-    df["volume_ratio"] = df["volume"] / (df["volume_ema"] + 1e-8)
+    volume_ema = _ema(df["volume"], 20)
+    feat["volume_ema"] = volume_ema
+    feat["volume_ratio"] = volume / (volume_ema + 1e-8)
 
     # Price returns
     if config.get("add_returns", True):
-        df["return_1"] = df["close"].pct_change(1)
-        df["return_3"] = df["close"].pct_change(3)
-        df["return_6"] = df["close"].pct_change(6)
-        df["return_12"] = df["close"].pct_change(12)
-        df["return_24"] = df["close"].pct_change(24)
+        for horizon in (1, 3, 6, 12, 24):
+            ret = np.full(len(close), np.nan)
+            ret[horizon:] = close[horizon:] / close[:-horizon] - 1.0
+            feat[f"return_{horizon}"] = ret
 
     # Price position relative to EMA
     for period in [12, 26, 50]:
-        if f"ema_{period}" in df.columns:
-            df[f"price_to_ema_{period}"] = (df["close"] - df[f"ema_{period}"]) / (df[f"ema_{period}"] + 1e-8)
+        if f"ema_{period}" in feat:
+            ema = feat[f"ema_{period}"]
+            feat[f"price_to_ema_{period}"] = (close - ema) / (ema + 1e-8)
 
     # Momentum
-    df["momentum_12"] = df["close"] - df["close"].shift(12)
+    momentum = np.full(len(close), np.nan)
+    momentum[12:] = close[12:] - close[:-12]
+    feat["momentum_12"] = momentum
+
+    # Keep engineered features in float32: sufficient precision for the
+    # models while halving the bytes moved during training
+    features = pd.DataFrame(feat, index=df.index, dtype=np.float32)
+    df = pd.concat([df, features], axis=1)
 
     # Drop rows with NaN values from indicators
     df = df.dropna().reset_index(drop=True)
@@ -157,28 +208,33 @@ def labeling(
     Returns:
         Tuple of (features_df, target_series)
     """
-    df = df.copy()
+    # One pass over the close array instead of pct_change + shift, which
+    # each allocate a temporary Series
+    close = df["close"].to_numpy(np.float64)
+    n = len(close)
+    horizon = min(target_horizon, n)
 
-    # Calculate future return
-    future_return = df["close"].pct_change(target_horizon).shift(-target_horizon)
+    future_return = np.full(n, np.nan, np.float32)
+    future_return[:n - horizon] = close[horizon:] / close[:n - horizon] - 1.0
 
     if task == "classification":
         if thresholds is None:
             thresholds = {"buy": 0.015, "sell": -0.01}
 
         # Create labels: BUY (2), HOLD (1), SELL (0)
-        labels = pd.Series(1, index=df.index, name="target")  # default HOLD
-        labels[future_return >= thresholds["buy"]] = 2  # BUY
-        labels[future_return <= thresholds["sell"]] = 0  # SELL
-
-        target = labels
+        labels = np.select(
+            [future_return >= thresholds["buy"], future_return <= thresholds["sell"]],
+            [2, 0],
+            default=1
+        ).astype(np.int8)
+        target = pd.Series(labels, index=df.index, name="target")
     else:  # regression
-        target = future_return.rename("target")
+        target = pd.Series(future_return, index=df.index, name="target")
 
-    # Remove rows without valid target
-    valid_idx = target.notna()
-    df = df[valid_idx].reset_index(drop=True)
-    target = target[valid_idx].reset_index(drop=True)
+    # The trailing horizon rows have no future bar to label against; a
+    # positional slice avoids the boolean-mask copy
+    df = df.iloc[:n - horizon].reset_index(drop=True)
+    target = target.iloc[:n - horizon].reset_index(drop=True)
 
     return df, target
 
@@ -210,10 +266,22 @@ def time_series_split(
     return train_df, valid_df, test_df
 
 
+@functools.lru_cache(maxsize=4)
+def _feature_cols(columns: Tuple[str, ...], target_col: str) -> Tuple[str, ...]:
+    """Select feature columns, cached since the schema is fold-invariant."""
+    exclude_cols = {target_col, "timestamp", "open", "high", "low", "close", "volume"}
+    return tuple(col for col in columns if col not in exclude_cols)
+
+
+def feature_columns(df: pd.DataFrame, target_col: str = "target") -> Tuple[str, ...]:
+    """Feature column names for a prepared frame (cached by schema)."""
+    return _feature_cols(tuple(df.columns), target_col)
+
+
 def prepare_features_target(
     df: pd.DataFrame,
     target_col: str = "target"
-) -> Tuple[pd.DataFrame, pd.Series]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Separate features and target from prepared DataFrame.
 
@@ -222,13 +290,14 @@ def prepare_features_target(
         target_col: Name of target column
 
     Returns:
-        Tuple of (X_features, y_target)
+        Tuple of (X_features, y_target) as arrays; X is a C-contiguous
+        float32 matrix so the model's fit/predict paths take the ndarray
+        fast path with no further conversion copies. Column names are
+        available via feature_columns.
     """
-    # Exclude non-feature columns
-    exclude_cols = [target_col, "timestamp", "open", "high", "low", "close", "volume"]
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
+    feature_cols = _feature_cols(tuple(df.columns), target_col)
 
-    X = df[feature_cols].copy()
-    y = df[target_col].copy()
+    X = np.ascontiguousarray(df[list(feature_cols)].to_numpy(np.float32))
+    y = df[target_col].to_numpy()
 
     return X, y
@@ -1,8 +1,14 @@
 """Genetic Algorithm for optimizing strategy signal weights."""
 
 import random
-from typing import Dict, List, Callable, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Callable, Optional, Tuple
 import numpy as np
+from joblib import Parallel, delayed
+
+
+# Bound on memoized fitness evaluations (LRU)
+_FIT_CACHE_SIZE = 10000
 
 
 class GeneticWeightOptimizer:
@@ -16,7 +22,9 @@ class GeneticWeightOptimizer:
         generations: int = 100,
         mutation_rate: float = 0.1,
         crossover_rate: float = 0.7,
-        elitism: int = 5
+        elitism: int = 5,
+        fitness_function_batch: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        n_jobs: int = 1
     ):
         """
         Initialize GA optimizer.
@@ -29,15 +37,24 @@ class GeneticWeightOptimizer:
             mutation_rate: Probability of mutation
             crossover_rate: Probability of crossover
             elitism: Number of top individuals to preserve
+            fitness_function_batch: Optional batched fitness taking a
+                [population_size, num_signals] weight matrix and returning an
+                array of scores; evaluates the whole generation in one sweep,
+                sharing feature/prediction work across individuals
+            n_jobs: Worker processes for per-individual fitness evaluation
+                (-1 = all cores); ignored when a batched fitness is provided
         """
         self.signal_names = signal_names
         self.fitness_function = fitness_function
+        self.fitness_function_batch = fitness_function_batch
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elitism = elitism
+        self.n_jobs = n_jobs
 
+        self._fit_cache: "OrderedDict[Tuple[float, ...], float]" = OrderedDict()
         self.population: List[np.ndarray] = []
         self.best_individual: np.ndarray = None
         self.best_fitness: float = -np.inf
@@ -53,23 +70,47 @@ class GeneticWeightOptimizer:
         self.population = [self._create_individual() for _ in range(self.population_size)]
 
     def _evaluate_fitness(self, individual: np.ndarray) -> float:
-        """Evaluate fitness of individual."""
+        """Evaluate fitness of individual, memoized by quantized weights.
+
+        Elites re-enter every generation unchanged and crossover produces
+        duplicates on converging populations, so cache hits skip the
+        backtest entirely. (Workers in the parallel path carry their own
+        cache copy, so memoization pays off mainly in sequential runs.)
+        """
+        key = tuple(np.round(individual, 4))
+        cached = self._fit_cache.get(key)
+        if cached is not None:
+            self._fit_cache.move_to_end(key)
+            return cached
+
         weights_dict = dict(zip(self.signal_names, individual.tolist()))
-        return self.fitness_function(weights_dict)
+        fitness = self.fitness_function(weights_dict)
 
-    def _select_parents(self, fitnesses: List[float]) -> Tuple[np.ndarray, np.ndarray]:
-        """Tournament selection."""
-        tournament_size = 3
+        self._fit_cache[key] = fitness
+        if len(self._fit_cache) > _FIT_CACHE_SIZE:
+            self._fit_cache.popitem(last=False)
+
+        return fitness
+
+    def _select_parents(self, fitnesses: List[float], num_pairs: int) -> np.ndarray:
+        """Tournament selection, vectorized for a whole generation.
 
-        def tournament():
-            indices = random.sample(range(len(self.population)), tournament_size)
-            tournament_fitnesses = [fitnesses[i] for i in indices]
-            winner_idx = indices[np.argmax(tournament_fitnesses)]
-            return self.population[winner_idx].copy()
+        Draws every tournament in one np.random.randint call and resolves
+        the winners with a single fancy-indexing pass, instead of Python-
+        level sampling per pair.
+
+        Returns:
+            Array of 2 * num_pairs winner indices into the population
+        """
+        tournament_size = 3
 
-        parent1 = tournament()
-        parent2 = tournament()
-        return parent1, parent2
+        fit_arr = np.asarray(fitnesses)
+        tourneys = np.random.randint(
+            0, len(self.population), size=(num_pairs * 2, tournament_size)
+        )
+        return tourneys[
+            np.arange(len(tourneys)), fit_arr[tourneys].argmax(axis=1)
+        ]
 
     def _crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Single-point crossover."""
@@ -107,7 +148,19 @@ class GeneticWeightOptimizer:
 
         for generation in range(self.generations):
             # Evaluate fitness
-            fitnesses = [self._evaluate_fitness(ind) for ind in self.population]
+            if self.fitness_function_batch is not None:
+                weight_matrix = np.stack(self.population)
+                fitnesses = np.asarray(
+                    self.fitness_function_batch(weight_matrix), dtype=float
+                ).tolist()
+            elif self.n_jobs != 1:
+                # Individuals are independent, so fan the dominant fitness
+                # cost out across cores
+                fitnesses = Parallel(n_jobs=self.n_jobs, backend="loky")(
+                    delayed(self._evaluate_fitness)(ind) for ind in self.population
+                )
+            else:
+                fitnesses = [self._evaluate_fitness(ind) for ind in self.population]
 
             # Track best
             gen_best_idx = np.argmax(fitnesses)
@@ -119,15 +172,20 @@ class GeneticWeightOptimizer:
 
             self.fitness_history.append(self.best_fitness)
 
-            # Elitism: preserve top individuals
-            elite_indices = np.argsort(fitnesses)[-self.elitism:]
+            # Elitism: preserve top individuals. Only the top-k indices are
+            # needed, so O(P) argpartition beats a full O(P log P) sort.
+            elite_indices = np.argpartition(np.asarray(fitnesses), -self.elitism)[-self.elitism:]
             elite = [self.population[i].copy() for i in elite_indices]
 
             # Create new population
             new_population = elite.copy()
 
-            while len(new_population) < self.population_size:
-                parent1, parent2 = self._select_parents(fitnesses)
+            num_pairs = (self.population_size - len(new_population) + 1) // 2
+            winners = self._select_parents(fitnesses, num_pairs)
+
+            for pair in range(num_pairs):
+                parent1 = self.population[winners[2 * pair]].copy()
+                parent2 = self.population[winners[2 * pair + 1]].copy()
                 child1, child2 = self._crossover(parent1, parent2)
                 child1 = self._mutate(child1)
                 child2 = self._mutate(child2)
@@ -151,6 +209,7 @@ def optimize_strategy_weights(
     backtest_function: Callable[[Dict[str, float]], Dict[str, float]],
     objective: str = "sharpe",
     constraints: Dict[str, float] = None,
+    batch_backtest_function: Optional[Callable[[np.ndarray], List[Dict[str, float]]]] = None,
     **ga_params
 ) -> Dict[str, float]:
     """
@@ -161,6 +220,10 @@ def optimize_strategy_weights(
         backtest_function: Function that takes weights and returns backtest metrics
         objective: Objective metric to maximize ("sharpe", "return", "win_rate")
         constraints: Optional constraints (e.g., {"max_drawdown": -0.2, "min_win_rate": 0.5})
+        batch_backtest_function: Optional vectorized backtest taking a
+            [population_size, num_signals] weight matrix and returning one
+            metrics dict per row; lets the GA evaluate a whole generation in
+            a single sweep over the data
         **ga_params: Additional GA parameters
 
     Returns:
@@ -169,10 +232,8 @@ def optimize_strategy_weights(
     if constraints is None:
         constraints = {}
 
-    def fitness_function(weights: Dict[str, float]) -> float:
-        """Fitness function with constraints."""
-        results = backtest_function(weights)
-
+    def score(results: Dict[str, float]) -> float:
+        """Apply constraints and extract the objective from backtest metrics."""
         # Check constraints
         if "max_drawdown" in constraints:
             if results.get("max_drawdown", 0) < constraints["max_drawdown"]:
@@ -192,9 +253,22 @@ def optimize_strategy_weights(
         else:
             return results.get(objective, 0)
 
+    def fitness_function(weights: Dict[str, float]) -> float:
+        """Fitness function with constraints."""
+        return score(backtest_function(weights))
+
+    fitness_function_batch = None
+    if batch_backtest_function is not None:
+        def fitness_function_batch(weight_matrix: np.ndarray) -> np.ndarray:
+            """Batched fitness over a whole generation."""
+            return np.array(
+                [score(results) for results in batch_backtest_function(weight_matrix)]
+            )
+
     optimizer = GeneticWeightOptimizer(
         signal_names=signal_names,
         fitness_function=fitness_function,
+        fitness_function_batch=fitness_function_batch,
         **ga_params
     )
 
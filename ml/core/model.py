@@ -4,11 +4,40 @@ import os
 from typing import Dict, Any, Optional, Literal
 import joblib
 import numpy as np
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier, GradientBoostingRegressor
+from joblib import Parallel, delayed
+
+# Swap in oneDAL-backed estimator implementations (vectorized and
+# multi-threaded) before the sklearn imports below resolve; optional, and
+# stock sklearn is used where the extension is unavailable
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
+
+from sklearn.ensemble import (
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor, RandomForestClassifier
+)
 from sklearn.linear_model import SGDClassifier, SGDRegressor
 from sklearn.preprocessing import StandardScaler
 
 
+def _fit_subforest(config: Dict[str, Any], n_sub: int, seed: int, X, y) -> RandomForestClassifier:
+    """Fit one slice of a random forest in a worker process.
+
+    Module-level so loky can pickle it; the fitted trees are grafted back
+    onto the full forest by MLModel._parallel_fit_rfc.
+    """
+    forest = RandomForestClassifier(
+        n_estimators=n_sub,
+        max_depth=config.get("max_depth", 10),
+        random_state=seed,
+        n_jobs=1
+    )
+    forest.fit(X, y)
+    return forest
+
+
 class MLModel:
     """Wrapper for sklearn models with support for online learning."""
 
@@ -23,10 +52,10 @@ class MLModel:
 
         Args:
             model_type: Model type code
-                - gbc: GradientBoostingClassifier
+                - gbc: HistGradientBoostingClassifier
                 - rfc: RandomForestClassifier
                 - sgdc: SGDClassifier (supports partial_fit)
-                - gbr: GradientBoostingRegressor
+                - gbr: HistGradientBoostingRegressor
                 - sgdr: SGDRegressor (supports partial_fit)
             task: "classification" or "regression"
             config: Model hyperparameters
@@ -38,14 +67,20 @@ class MLModel:
         self.model = self._build_model()
         self.feature_names = None
         self.is_fitted = False
+        self._mean = None
+        self._inv_scale = None
 
     def _build_model(self):
         """Build sklearn model based on type."""
+        # The histogram variants bin features once and grow trees on the
+        # bins: training is typically an order of magnitude faster than
+        # the exact GradientBoosting* models on tens of thousands of rows
         if self.model_type == "gbc":
-            return GradientBoostingClassifier(
-                n_estimators=self.config.get("n_estimators", 100),
+            return HistGradientBoostingClassifier(
+                max_iter=self.config.get("n_estimators", 100),
                 learning_rate=self.config.get("learning_rate", 0.1),
                 max_depth=self.config.get("max_depth", 5),
+                early_stopping=self.config.get("early_stopping", True),
                 random_state=self.config.get("random_state", 42)
             )
         elif self.model_type == "rfc":
@@ -62,10 +97,11 @@ class MLModel:
                 random_state=self.config.get("random_state", 42)
             )
         elif self.model_type == "gbr":
-            return GradientBoostingRegressor(
-                n_estimators=self.config.get("n_estimators", 100),
+            return HistGradientBoostingRegressor(
+                max_iter=self.config.get("n_estimators", 100),
                 learning_rate=self.config.get("learning_rate", 0.1),
                 max_depth=self.config.get("max_depth", 5),
+                early_stopping=self.config.get("early_stopping", True),
                 random_state=self.config.get("random_state", 42)
             )
         elif self.model_type == "sgdr":
@@ -76,26 +112,101 @@ class MLModel:
         else:
             raise ValueError(f"Unknown model type: {self.model_type}")
 
-    def fit(self, X, y):
+    def _cache_scaler_params(self):
+        """Cache scaler stats for the in-place float32 transform path."""
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+
+    def _scale(self, X) -> np.ndarray:
+        """Standardize X without the extra float64 allocation.
+
+        For float32 input the copy made here doubles as the output buffer
+        and both standardization ops run in place, halving the memory
+        traffic of scaler.transform on the serving hot path. Other dtypes
+        go through sklearn and are then cast down, so the estimators always
+        see float32 and skip their internal float64 conversion copy.
+
+        Histogram gradient boosting bins raw features and is scale-
+        invariant, so gbc/gbr skip standardization entirely.
+        """
+        if self.model_type in ("gbc", "gbr"):
+            return np.asarray(X, dtype=np.float32)
+        if self._mean is not None and getattr(X, "dtype", None) == np.float32:
+            X_scaled = np.ascontiguousarray(X, dtype=np.float32)
+            if X_scaled is X:
+                # Never standardize the caller's array in place
+                X_scaled = X.copy()
+            np.subtract(X_scaled, self._mean, out=X_scaled)
+            np.multiply(X_scaled, self._inv_scale, out=X_scaled)
+            return X_scaled
+        return self.scaler.transform(X).astype(np.float32, copy=False)
+
+    def fit(self, X, y, feature_names=None):
         """
         Train model on data.
 
         Args:
             X: Feature matrix (DataFrame or ndarray)
             y: Target vector
+            feature_names: Column names when X is a plain ndarray
         """
         if hasattr(X, "columns"):
-            self.feature_names = list(X.columns)
+            feature_names = list(X.columns)
             X = X.values
-
-        # Fit scaler and transform
-        X_scaled = self.scaler.fit_transform(X)
+        if feature_names is not None:
+            self.feature_names = list(feature_names)
+
+        # Fit scaler and transform; train in float32 to halve memory
+        # bandwidth inside the estimator. The histogram models bin raw
+        # features, so for them the scaler pass is skipped
+        if self.model_type in ("gbc", "gbr"):
+            X_scaled = np.asarray(X, dtype=np.float32)
+        else:
+            X_scaled = self.scaler.fit_transform(X).astype(np.float32, copy=False)
 
         # Fit model
-        self.model.fit(X_scaled, y)
+        if self.model_type == "rfc":
+            self._parallel_fit_rfc(X_scaled, y)
+        else:
+            self.model.fit(X_scaled, y)
         self.is_fitted = True
+        if self.model_type not in ("gbc", "gbr"):
+            self._cache_scaler_params()
 
-    def partial_fit(self, X, y, classes=None):
+    def _parallel_fit_rfc(self, X, y):
+        """Train the random forest as independent subforests across processes.
+
+        Trees are embarrassingly parallel, but sklearn's thread-based
+        n_jobs still serializes the Python-level bookkeeping under the
+        GIL. Fitting seed-disjoint subforests in loky workers and merging
+        their estimators_ lists sidesteps that while producing the same
+        kind of model.
+        """
+        n_estimators = self.config.get("n_estimators", 100)
+        n_workers = min(os.cpu_count() or 1, n_estimators)
+        if n_workers <= 1:
+            self.model.fit(X, y)
+            return
+
+        sizes = [n_estimators // n_workers] * n_workers
+        for i in range(n_estimators % n_workers):
+            sizes[i] += 1
+        base_seed = self.config.get("random_state", 42)
+
+        subforests = Parallel(n_jobs=n_workers, backend="loky")(
+            delayed(_fit_subforest)(self.config, n_sub, base_seed + i, X, y)
+            for i, n_sub in enumerate(sizes)
+        )
+
+        # The first subforest carries the fitted metadata (classes_,
+        # n_features_in_, ...); extend it with everyone else's trees
+        merged = subforests[0]
+        merged.estimators_ = [tree for forest in subforests for tree in forest.estimators_]
+        merged.n_estimators = len(merged.estimators_)
+        merged.n_jobs = self.config.get("n_jobs", -1)
+        self.model = merged
+
+    def partial_fit(self, X, y, classes=None, batch_size: int = 4096):
         """
         Incrementally train model (only for SGD models).
 
@@ -103,6 +214,7 @@ class MLModel:
             X: Feature matrix
             y: Target vector
             classes: Class labels (required for first call on classifier)
+            batch_size: Rows per internal partial_fit call
         """
         if self.model_type not in ["sgdc", "sgdr"]:
             raise ValueError(f"Model type {self.model_type} does not support partial_fit")
@@ -114,17 +226,32 @@ class MLModel:
 
         # Transform with existing scaler or fit new one
         if not self.is_fitted:
-            X_scaled = self.scaler.fit_transform(X)
-        else:
-            X_scaled = self.scaler.transform(X)
-
-        # Partial fit
-        if self.task == "classification" and not self.is_fitted:
-            if classes is None:
-                classes = np.unique(y)
-            self.model.partial_fit(X_scaled, y, classes=classes)
+            X_scaled = self.scaler.fit_transform(X).astype(np.float32, copy=False)
+            self._cache_scaler_params()
         else:
-            self.model.partial_fit(X_scaled, y)
+            X_scaled = self._scale(X)
+
+        # Shuffle once, then stream cache-sized mini-batches through
+        # partial_fit: SGD takes more useful steps on shuffled small
+        # batches than on one large ordered chunk
+        y = np.asarray(y)
+        if len(X_scaled) > batch_size:
+            rng = np.random.default_rng(self.config.get("random_state", 42))
+            perm = rng.permutation(len(X_scaled))
+            X_scaled = X_scaled[perm]
+            y = y[perm]
+
+        first_call = not self.is_fitted
+        if self.task == "classification" and first_call and classes is None:
+            classes = np.unique(y)
+
+        for i in range(0, len(X_scaled), batch_size):
+            X_batch = X_scaled[i:i + batch_size]
+            y_batch = y[i:i + batch_size]
+            if self.task == "classification" and first_call and i == 0:
+                self.model.partial_fit(X_batch, y_batch, classes=classes)
+            else:
+                self.model.partial_fit(X_batch, y_batch)
 
         self.is_fitted = True
 
@@ -144,7 +271,16 @@ class MLModel:
         if hasattr(X, "values"):
             X = X.values
 
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scale(X)
+        if self.model_type == "rfc" and len(X_scaled) < 10_000:
+            # On small batches joblib worker dispatch costs more than the
+            # trees themselves; score them on a single thread
+            n_jobs = self.model.n_jobs
+            self.model.n_jobs = 1
+            try:
+                return self.model.predict(X_scaled)
+            finally:
+                self.model.n_jobs = n_jobs
         return self.model.predict(X_scaled)
 
     def predict_proba(self, X):
@@ -166,9 +302,47 @@ class MLModel:
         if hasattr(X, "values"):
             X = X.values
 
-        X_scaled = self.scaler.transform(X)
+        X_scaled = self._scale(X)
+        if self.model_type == "rfc" and len(X_scaled) < 10_000:
+            # See predict: parallel dispatch dominates on small batches
+            n_jobs = self.model.n_jobs
+            self.model.n_jobs = 1
+            try:
+                return self.model.predict_proba(X_scaled)
+            finally:
+                self.model.n_jobs = n_jobs
         return self.model.predict_proba(X_scaled)
 
+    def extend(self, X, y, n_more: int = 50):
+        """
+        Grow a fitted gradient-boosting model by additional iterations.
+
+        warm_start is switched on only for this call, so the existing
+        trees are kept and just the new iterations are fitted; a regular
+        fit() afterwards still retrains from scratch, which the
+        walk-forward backtest relies on for its per-fold refits.
+
+        Args:
+            X: Feature matrix
+            y: Target vector
+            n_more: Number of boosting iterations to add
+        """
+        if self.model_type not in ["gbc", "gbr"]:
+            raise ValueError(f"Model type {self.model_type} does not support extend")
+        if not self.is_fitted:
+            raise ValueError("Model not fitted yet")
+
+        if hasattr(X, "values"):
+            X = X.values
+
+        X_scaled = self._scale(X)
+        self.model.warm_start = True
+        try:
+            self.model.max_iter += n_more
+            self.model.fit(X_scaled, y)
+        finally:
+            self.model.warm_start = False
+
     def supports_partial_fit(self) -> bool:
         """Check if model supports online learning."""
         return self.model_type in ["sgdc", "sgdr"]
@@ -206,7 +380,14 @@ class MLModel:
             "is_fitted": self.is_fitted
         }
 
-        joblib.dump(model_data, os.path.join(path, "model.joblib"))
+        # lz4 trades a little ratio for near-memcpy speed, and pickle
+        # protocol 5 serializes the numpy buffers out-of-band
+        joblib.dump(
+            model_data,
+            os.path.join(path, "model.joblib"),
+            compress=("lz4", 3),
+            protocol=5
+        )
 
     @classmethod
     def load(cls, path: str) -> "MLModel":
@@ -229,5 +410,9 @@ class MLModel:
         instance.config = model_data["config"]
         instance.feature_names = model_data["feature_names"]
         instance.is_fitted = model_data["is_fitted"]
+        instance._mean = None
+        instance._inv_scale = None
+        if instance.is_fitted and hasattr(instance.scaler, "mean_"):
+            instance._cache_scaler_params()
 
         return instance
@@ -2,24 +2,92 @@
 
 import os
 import json
+import threading
 from datetime import datetime
 from typing import Dict, Any, Tuple
 import pandas as pd
 import numpy as np
+from joblib import Parallel, delayed
 from sklearn.metrics import (
-    accuracy_score, f1_score, precision_score, recall_score,
-    roc_auc_score, mean_absolute_error, mean_squared_error, r2_score
+    accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
 )
 
 from .model import MLModel
-from .data import prepare_features_target
+from .data import prepare_features_target, feature_columns
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _dump_json(obj: Any, path: str) -> None:
+    """Write pretty-printed JSON, via orjson's native encoder when available."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    """Read a JSON file, via orjson's native parser when available."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _reg_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float, float]:
+    """Accumulate MAE, MSE and the R² sums in one pass over the arrays.
+
+    Separate sklearn metric calls each re-walk both arrays; fusing them
+    keeps the data in cache for a single traversal. JIT-compiled when
+    numba is available, with a vectorized NumPy fallback below.
+
+    Returns:
+        Tuple of (mae, mse, ss_res, ss_tot)
+    """
+    n = len(y_true)
+    mean_true = y_true.mean()
+    abs_err = 0.0
+    sq_err = 0.0
+    ss_tot = 0.0
+    for i in range(n):
+        err = y_pred[i] - y_true[i]
+        abs_err += abs(err)
+        sq_err += err * err
+        dev = y_true[i] - mean_true
+        ss_tot += dev * dev
+    return abs_err / n, sq_err / n, sq_err, ss_tot
+
+
+if njit is not None:
+    _reg_metrics = njit(fastmath=True, cache=True)(_reg_metrics)
+    # Compile at import time so the first real metrics call does not pay
+    # the JIT latency
+    _reg_metrics(np.zeros(8), np.zeros(8))
+else:
+    def _reg_metrics(y_true, y_pred):  # noqa: F811
+        err = y_pred - y_true
+        dev = y_true - y_true.mean()
+        sq_err = float(err @ err)
+        return float(np.abs(err).mean()), sq_err / len(y_true), sq_err, float(dev @ dev)
 
 
 def calculate_metrics(
     y_true: np.ndarray,
     y_pred: np.ndarray,
     task: str,
-    y_proba: np.ndarray = None
+    y_proba: np.ndarray = None,
+    classes: np.ndarray = None
 ) -> Dict[str, float]:
     """
     Calculate evaluation metrics.
@@ -29,6 +97,9 @@ def calculate_metrics(
         y_pred: Predicted labels/values
         task: "classification" or "regression"
         y_proba: Predicted probabilities (for classification)
+        classes: Label order of y_proba's columns (the fitted model's
+            classes_); needed for a correct multi-class AUC when the
+            evaluation slice is missing a class
 
     Returns:
         Dictionary of metrics
@@ -47,15 +118,40 @@ def calculate_metrics(
                 if y_proba.shape[1] == 2:  # binary
                     metrics["auc"] = float(roc_auc_score(y_true, y_proba[:, 1]))
                 else:  # multi-class
-                    metrics["auc"] = float(roc_auc_score(y_true, y_proba, multi_class="ovr", average="weighted"))
+                    # The one-vs-rest AUCs are independent; score them in
+                    # threads (roc_auc_score releases the GIL in its numpy
+                    # sort) and weight by class support. y_proba's columns
+                    # follow the fitted model's classes_, which can be a
+                    # superset of the labels in this slice, so the
+                    # class-to-column mapping must be explicit; classes
+                    # that never occur here are simply not scored.
+                    y_true_arr = np.asarray(y_true)
+                    if classes is None:
+                        classes = np.unique(y_true_arr)
+                    classes = np.asarray(classes)
+                    if len(classes) != y_proba.shape[1]:
+                        raise ValueError("classes does not match y_proba columns")
+                    support = np.array([(y_true_arr == c).sum() for c in classes])
+                    scored = np.nonzero(support)[0]
+                    aucs = Parallel(n_jobs=-1, prefer="threads")(
+                        delayed(roc_auc_score)(
+                            (y_true_arr == classes[i]).astype(np.int8), y_proba[:, i]
+                        )
+                        for i in scored
+                    )
+                    metrics["auc"] = float(np.average(aucs, weights=support[scored]))
             except Exception:
                 pass
 
     else:  # regression
-        metrics["mae"] = float(mean_absolute_error(y_true, y_pred))
-        metrics["mse"] = float(mean_squared_error(y_true, y_pred))
-        metrics["rmse"] = float(np.sqrt(metrics["mse"]))
-        metrics["r2"] = float(r2_score(y_true, y_pred))
+        mae, mse, ss_res, ss_tot = _reg_metrics(
+            np.ascontiguousarray(y_true, dtype=np.float64),
+            np.ascontiguousarray(y_pred, dtype=np.float64)
+        )
+        metrics["mae"] = float(mae)
+        metrics["mse"] = float(mse)
+        metrics["rmse"] = float(np.sqrt(mse))
+        metrics["r2"] = float(1.0 - ss_res / ss_tot) if ss_tot > 0 else 0.0
 
     return metrics
 
@@ -80,26 +176,30 @@ def train_model(
     """
     # Prepare train data
     X_train, y_train = prepare_features_target(train_df, target_col)
+    feature_names = feature_columns(train_df, target_col)
 
     # Prepare validation data
     X_valid, y_valid = prepare_features_target(valid_df, target_col)
 
     # Train
-    model.fit(X_train, y_train)
+    model.fit(X_train, y_train, feature_names=feature_names)
 
     # Predict on validation
     y_pred = model.predict(X_valid)
     y_proba = model.predict_proba(X_valid) if model.task == "classification" else None
 
     # Calculate metrics
-    metrics = calculate_metrics(y_valid, y_pred, model.task, y_proba)
+    metrics = calculate_metrics(
+        y_valid, y_pred, model.task, y_proba,
+        classes=model.model.classes_ if y_proba is not None else None
+    )
 
     # Add training info
     training_info = {
         "train_samples": len(train_df),
         "valid_samples": len(valid_df),
-        "n_features": len(X_train.columns),
-        "feature_names": list(X_train.columns),
+        "n_features": len(feature_names),
+        "feature_names": list(feature_names),
         "metrics": metrics
     }
 
@@ -147,12 +247,52 @@ def save_training_artifacts(
     }
 
     # Save metadata
-    with open(os.path.join(model_dir, "metrics.json"), "w") as f:
-        json.dump(metadata, f, indent=2)
+    _dump_json(metadata, os.path.join(model_dir, "metrics.json"))
+
+    _append_to_index(base_dir, metadata)
 
     return model_dir
 
 
+# Serializes index read-modify-write cycles: the atomic rename below only
+# protects readers, not two writers appending at once
+_INDEX_LOCK = threading.Lock()
+
+
+def _index_row(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one model's metadata into an index/listing row."""
+    row = {
+        "model_id": metadata["model_id"],
+        "model_type": metadata["model_type"],
+        "task": metadata["task"],
+        "created_at": metadata["created_at"]
+    }
+    for name, value in metadata.get("training", {}).get("metrics", {}).items():
+        row[f"metric_{name}"] = value
+    return row
+
+
+def _append_to_index(base_dir: str, metadata: Dict[str, Any]) -> None:
+    """Append one model's summary row to base_dir/index.parquet.
+
+    The index lets list_models answer from a single parquet read instead
+    of opening every model's metrics.json. Written under _INDEX_LOCK via
+    temp file + atomic rename so concurrent jobs neither drop each
+    other's rows nor expose a partial file to readers.
+    """
+    index_path = os.path.join(base_dir, "index.parquet")
+    row = pd.DataFrame([_index_row(metadata)])
+
+    with _INDEX_LOCK:
+        index = row
+        if os.path.exists(index_path):
+            index = pd.concat([pd.read_parquet(index_path), row], ignore_index=True)
+
+        tmp_path = index_path + ".tmp"
+        index.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, index_path)
+
+
 def load_model_with_metadata(model_id: str, base_dir: str = None) -> Tuple[MLModel, Dict[str, Any]]:
     """
     Load model and its metadata.
@@ -173,8 +313,7 @@ def load_model_with_metadata(model_id: str, base_dir: str = None) -> Tuple[MLMod
     model = MLModel.load(model_dir)
 
     # Load metadata
-    with open(os.path.join(model_dir, "metrics.json"), "r") as f:
-        metadata = json.load(f)
+    metadata = _load_json(os.path.join(model_dir, "metrics.json"))
 
     return model, metadata
 
@@ -187,7 +326,10 @@ def list_models(base_dir: str = None) -> list:
         base_dir: Base directory for models
 
     Returns:
-        List of model metadata dictionaries
+        List of model summary rows (model_id, model_type, task,
+        created_at, flattened metric_* columns and a nested
+        training.metrics block), newest first. Full metadata remains
+        available per model via load_model_with_metadata.
     """
     if base_dir is None:
         base_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "models")
@@ -195,15 +337,38 @@ def list_models(base_dir: str = None) -> list:
     if not os.path.exists(base_dir):
         return []
 
-    models = []
-    for model_id in os.listdir(base_dir):
-        metrics_path = os.path.join(base_dir, model_id, "metrics.json")
-        if os.path.exists(metrics_path):
-            with open(metrics_path, "r") as f:
-                metadata = json.load(f)
-                models.append(metadata)
-
-    # Sort by creation date (newest first)
-    models.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    # Fast path: one parquet read instead of a metrics.json per model
+    index_path = os.path.join(base_dir, "index.parquet")
+    if os.path.exists(index_path):
+        index = pd.read_parquet(index_path)
+        models = index.sort_values("created_at", ascending=False).to_dict("records")
+    else:
+        # Fallback for model directories written before the index
+        # existed, flattened through the same row schema as the index so
+        # callers see one shape either way. scandir reuses the stat info
+        # from the directory read, so the is-directory check costs no
+        # extra syscall per entry.
+        models = []
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                metrics_path = os.path.join(entry.path, "metrics.json")
+                if os.path.exists(metrics_path):
+                    models.append(_index_row(_load_json(metrics_path)))
+
+        # Sort by creation date (newest first)
+        models.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+
+    # Rebuild the nested training.metrics block the /models consumers
+    # read (the frontend uses model.training.metrics.*); parquet stores
+    # only the flat metric_* columns, and mixed-task indexes pad absent
+    # metrics with NaN
+    for row in models:
+        row["training"] = {"metrics": {
+            key[len("metric_"):]: value
+            for key, value in row.items()
+            if key.startswith("metric_") and pd.notna(value)
+        }}
 
     return models
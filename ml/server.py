@@ -1,14 +1,24 @@
 """FastAPI server for ML training and backtesting."""
 
 import os
+import copy
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Literal
 from fastapi import FastAPI, HTTPException, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+import numpy as np
 import pandas as pd
+from joblib import Memory
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from core.data import (
     load_hf_dataset,
@@ -21,7 +31,8 @@ from core.train import (
     train_model,
     save_training_artifacts,
     load_model_with_metadata,
-    list_models
+    list_models,
+    calculate_metrics
 )
 from core.backtest import WalkForwardBacktest
 
@@ -43,6 +54,42 @@ api_v1_router = APIRouter(prefix="/api/v1")
 # In-memory job registry
 jobs: Dict[str, Dict[str, Any]] = {}
 
+# Executor for training/backtest jobs so handlers return immediately and
+# uvicorn's event loop stays responsive. Threads rather than processes:
+# workers must update the in-memory jobs registry, and the heavy lifting
+# inside (numpy, sklearn, loky subforests) releases the GIL or forks its
+# own worker processes anyway.
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+# Disk-backed memoization of the pure, expensive data-prep steps: repeat
+# jobs over the same dataset and config replay cached results instead of
+# recomputing every indicator and label
+MEM = Memory(
+    os.path.join(os.path.dirname(__file__), "..", "cache"),
+    verbose=0,
+    compress=("lz4", 3)
+)
+_feature_engineering = MEM.cache(feature_engineering)
+_labeling = MEM.cache(labeling)
+
+_MODELS_BASE_DIR = os.path.join(os.path.dirname(__file__), "..", "models")
+
+
+@lru_cache(maxsize=16)
+def _cached_load(model_id: str, mtime: float):
+    """Deserialize a model, keyed by (model_id, mtime of its joblib file).
+
+    Including the mtime in the key makes the cache self-invalidating:
+    re-saving a model changes the key and forces a fresh load.
+    """
+    return load_model_with_metadata(model_id)
+
+
+def _load_model(model_id: str):
+    """Cached wrapper around load_model_with_metadata."""
+    model_path = os.path.join(_MODELS_BASE_DIR, model_id, "model.joblib")
+    return _cached_load(model_id, os.path.getmtime(model_path))
+
 
 class TrainRequest(BaseModel):
     """Training request schema."""
@@ -74,6 +121,34 @@ class BacktestRequest(BaseModel):
     sell_threshold: float = 0.4
 
 
+@app.on_event("startup")
+async def warmup():
+    """Pre-touch the hot paths so the first real request does not pay for
+    sklearn's lazy imports, loky worker spawn and kernel warmup."""
+    def _warm():
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((32, 4)).astype(np.float32)
+        y_cls = rng.integers(0, 3, 32)
+        y_reg = rng.standard_normal(32).astype(np.float64)
+
+        for model_type, task, y in (
+            ("gbc", "classification", y_cls),
+            ("rfc", "classification", y_cls),
+            ("sgdc", "classification", y_cls),
+            ("gbr", "regression", y_reg),
+            ("sgdr", "regression", y_reg)
+        ):
+            model = MLModel(model_type, task, {"n_estimators": 2, "max_iter": 5})
+            model.fit(X, y)
+            model.predict(X)
+
+        # Touches the fused regression-metrics kernel as well
+        calculate_metrics(y_reg, y_reg, "regression")
+
+    # Fire and forget: the server starts serving while the warmup runs
+    EXECUTOR.submit(_warm)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -86,24 +161,8 @@ async def root():
     }
 
 
-@api_v1_router.post("/train/start")
-async def start_training(request: TrainRequest):
-    """
-    Start model training job.
-
-    Returns job_id for tracking progress.
-    """
-    job_id = str(uuid.uuid4())
-
-    jobs[job_id] = {
-        "job_id": job_id,
-        "status": "running",
-        "progress": 0,
-        "created_at": datetime.utcnow().isoformat(),
-        "type": "train",
-        "request": request.dict()
-    }
-
+def _run_train_job(job_id: str, request: TrainRequest):
+    """Execute a training job, updating the jobs registry as it goes."""
     try:
         # Load dataset
         hf_token = os.getenv("HF_TOKEN")
@@ -117,12 +176,12 @@ async def start_training(request: TrainRequest):
 
         # Feature engineering
         feature_config = request.feature_config or {}
-        df = feature_engineering(df, feature_config)
+        df = _feature_engineering(df, feature_config)
 
         jobs[job_id]["progress"] = 40
 
         # Labeling
-        df, target = labeling(df, request.target_horizon, request.task)
+        df, target = _labeling(df, request.target_horizon, request.task)
         df["target"] = target
 
         # Time series split
@@ -171,30 +230,14 @@ async def start_training(request: TrainRequest):
     except Exception as e:
         jobs[job_id]["status"] = "failed"
         jobs[job_id]["error"] = str(e)
-        raise HTTPException(status_code=500, detail=str(e))
-
-    return {
-        "job_id": job_id,
-        "status": jobs[job_id]["status"],
-        "model_id": jobs[job_id].get("result", {}).get("model_id")
-    }
-
-
-@api_v1_router.get("/train/status")
-async def get_training_status(job_id: str):
-    """Get training job status and progress."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    return jobs[job_id]
 
 
-@api_v1_router.post("/backtest/run")
-async def run_backtest(request: BacktestRequest):
+@api_v1_router.post("/train/start")
+async def start_training(request: TrainRequest):
     """
-    Run walk-forward backtest.
+    Start model training job in the background.
 
-    Returns backtest results and artifact paths.
+    Returns job_id immediately; poll /train/status for progress.
     """
     job_id = str(uuid.uuid4())
 
@@ -203,11 +246,29 @@ async def run_backtest(request: BacktestRequest):
         "status": "running",
         "progress": 0,
         "created_at": datetime.utcnow().isoformat(),
-        "type": "backtest",
+        "type": "train",
         "request": request.dict()
     }
 
+    EXECUTOR.submit(_run_train_job, job_id, request)
+
+    return {"job_id": job_id, "status": "running"}
+
+
+@api_v1_router.get("/train/status")
+async def get_training_status(job_id: str):
+    """Get training job status and progress."""
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return jobs[job_id]
+
+
+def _run_backtest_job(job_id: str, request: BacktestRequest):
+    """Execute a backtest job, updating the jobs registry as it goes."""
     try:
+        hf_token = os.getenv("HF_TOKEN")
+
         # Load or train model
         if request.model_id:
             # Use existing model
@@ -219,8 +280,24 @@ async def run_backtest(request: BacktestRequest):
             else:
                 model_id = request.model_id
 
-            model, metadata = load_model_with_metadata(model_id)
+            model, metadata = _load_model(model_id)
+            if request.online:
+                # Online learning mutates the model; never touch the
+                # cached instance
+                model = copy.deepcopy(model)
             dataset_id = metadata["dataset"]["dataset"]
+
+            jobs[job_id]["progress"] = 30
+
+            # Load backtest dataset
+            df = load_hf_dataset(dataset_id, token=hf_token)
+
+            if "symbol" in df.columns:
+                df = df[df["symbol"].isin(request.symbols)]
+
+            df = _feature_engineering(df, {})
+            df, target = _labeling(df, 12, model.task)
+            df["target"] = target
         else:
             # Auto-train mode
             if not request.dataset:
@@ -228,15 +305,15 @@ async def run_backtest(request: BacktestRequest):
 
             dataset_id = request.dataset
 
-            # Quick training
-            hf_token = os.getenv("HF_TOKEN")
+            # Quick training; the prepared frame is reused for the
+            # backtest below rather than loaded and featurized again
             df = load_hf_dataset(dataset_id, token=hf_token)
 
             if "symbol" in df.columns:
                 df = df[df["symbol"].isin(request.symbols)]
 
-            df = feature_engineering(df, {})
-            df, target = labeling(df, 12, "classification")
+            df = _feature_engineering(df, {})
+            df, target = _labeling(df, 12, "classification")
             df["target"] = target
 
             train_df, valid_df, _ = time_series_split(df, 0.7, 0.15)
@@ -244,22 +321,6 @@ async def run_backtest(request: BacktestRequest):
             model = MLModel("gbc", "classification", {})
             model, _ = train_model(train_df, valid_df, model)
 
-        jobs[job_id]["progress"] = 30
-
-        # Load backtest dataset
-        hf_token = os.getenv("HF_TOKEN")
-        df = load_hf_dataset(dataset_id, token=hf_token)
-
-        if "symbol" in df.columns:
-            df = df[df["symbol"].isin(request.symbols)]
-
-        # Feature engineering
-        df = feature_engineering(df, {})
-
-        # Labeling
-        df, target = labeling(df, 12, model.task)
-        df["target"] = target
-
         jobs[job_id]["progress"] = 50
 
         # Parse window sizes
@@ -296,8 +357,13 @@ async def run_backtest(request: BacktestRequest):
             "results": results
         }
 
-        with open(os.path.join(artifact_dir, "report.json"), "w") as f:
-            json.dump(report, f, indent=2)
+        report_path = os.path.join(artifact_dir, "report.json")
+        if orjson is not None:
+            with open(report_path, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(report_path, "w") as f:
+                json.dump(report, f, indent=2)
 
         # Save updated model if online learning
         if request.online and request.save_updates and model.supports_partial_fit():
@@ -315,15 +381,31 @@ async def run_backtest(request: BacktestRequest):
     except Exception as e:
         jobs[job_id]["status"] = "failed"
         jobs[job_id]["error"] = str(e)
-        raise HTTPException(status_code=500, detail=str(e))
 
-    return {
+
+@api_v1_router.post("/backtest/run")
+async def run_backtest(request: BacktestRequest):
+    """
+    Start a walk-forward backtest in the background.
+
+    Returns job_id immediately; poll /backtest/status for progress and
+    results.
+    """
+    job_id = str(uuid.uuid4())
+
+    jobs[job_id] = {
         "job_id": job_id,
-        "status": jobs[job_id]["status"],
-        "run_id": jobs[job_id].get("result", {}).get("run_id"),
-        "results": jobs[job_id].get("result", {}).get("results")
+        "status": "running",
+        "progress": 0,
+        "created_at": datetime.utcnow().isoformat(),
+        "type": "backtest",
+        "request": request.dict()
     }
 
+    EXECUTOR.submit(_run_backtest_job, job_id, request)
+
+    return {"job_id": job_id, "status": "running"}
+
 
 @api_v1_router.get("/backtest/status")
 async def get_backtest_status(job_id: str):
@@ -348,7 +430,7 @@ async def get_models():
 async def get_model_metrics(model_id: str):
     """Get detailed metrics for a specific model."""
     try:
-        _, metadata = load_model_with_metadata(model_id)
+        _, metadata = _load_model(model_id)
         return metadata
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Model not found")
@@ -364,21 +446,31 @@ async def list_artifacts():
     if not os.path.exists(base_dir):
         return {"artifacts": [], "count": 0}
 
+    # scandir reuses the stat info from the directory read instead of one
+    # stat syscall per listdir entry
     artifacts = []
-    for run_id in os.listdir(base_dir):
-        report_path = os.path.join(base_dir, run_id, "report.json")
-        if os.path.exists(report_path):
-            with open(report_path, "r") as f:
-                report = json.load(f)
-                artifacts.append({
-                    "run_id": run_id,
-                    "created_at": report.get("created_at"),
-                    "summary": {
-                        "total_return_pct": report.get("results", {}).get("total_return_pct"),
-                        "sharpe_ratio": report.get("results", {}).get("sharpe_ratio"),
-                        "win_rate": report.get("results", {}).get("win_rate")
-                    }
-                })
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            report_path = os.path.join(entry.path, "report.json")
+            if not os.path.exists(report_path):
+                continue
+            if orjson is not None:
+                with open(report_path, "rb") as f:
+                    report = orjson.loads(f.read())
+            else:
+                with open(report_path, "r") as f:
+                    report = json.load(f)
+            artifacts.append({
+                "run_id": entry.name,
+                "created_at": report.get("created_at"),
+                "summary": {
+                    "total_return_pct": report.get("results", {}).get("total_return_pct"),
+                    "sharpe_ratio": report.get("results", {}).get("sharpe_ratio"),
+                    "win_rate": report.get("results", {}).get("win_rate")
+                }
+            })
 
     artifacts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
 